@@ -1,12 +1,19 @@
 """CSV ingestion script for processing and storing image frame data."""
 
 import asyncio
+import contextlib
 import csv
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 import numpy as np
+from sqlalchemy import Connection, Table, text
 
 from image_api.clients.database import db_client
 from image_api.config.logging_config import setup_logging
@@ -14,120 +21,408 @@ from image_api.config.settings import settings
 from image_api.models.database import ImageFrame
 from image_api.utilities.compression import (
     calculate_compression_ratio,
-    compress_array,
+    compress_many,
+    pack_array,
 )
 from image_api.utilities.image_processing import (
     calculate_image_statistics,
-    resize_image,
+    resize_image_batch,
 )
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
-async def process_csv_file(csv_path: Path, batch_size: int = 100) -> None:
-    """Process CSV file and ingest image frames into database.
+# Target columns for COPY, in record tuple order
+COPY_COLUMNS = ["depth", "original_data", "resized_data", "metadata"]
+
+# image_frames table, typed as Table for its indexes
+FRAMES_TABLE = cast(Table, ImageFrame.__table__)
+
+# CSV pixel column names, formatted once rather than per row
+COLS = [f"col{i}" for i in range(1, settings.image_original_width + 1)]
+
+
+def _csv_usecols(header_line: str) -> list[int]:
+    """Resolve column indexes for depth followed by col1..colN.
 
     Args:
-        csv_path: Path to CSV file
-        batch_size: Number of frames to process in each batch
+        header_line: First line of the CSV file
+
+    Returns:
+        list[int]: Column indexes in (depth, col1, ..., colN) order
 
     Raises:
-        FileNotFoundError: If CSV file doesn't exist
-        ValueError: If CSV format is invalid
+        ValueError: If a required column is missing from the header
     """
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    header = next(csv.reader([header_line]))
+    positions = {name.strip(): index for index, name in enumerate(header)}
 
-    # Initialize database
-    db_client.initialize()
-    await db_client.create_tables()
+    names = ["depth", *COLS]
+    missing = [name for name in names if name not in positions]
+    if missing:
+        raise ValueError(f"Missing column: {missing[0]}")
 
-    # Read CSV file
-    frames_to_insert: list[ImageFrame] = []
-    total_processed = 0
+    return [positions[name] for name in names]
 
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        row_count = sum(1 for _ in reader)
-        f.seek(0)
-        reader = csv.DictReader(f)
 
-        print(f"Processing {row_count} rows from {csv_path}...")
+def _parse_rows(
+    lines: list[str], usecols: list[int]
+) -> tuple["NDArray[np.float64]", "NDArray[np.uint8]"]:
+    """Parse CSV lines into a depth vector and an (N, width) pixel matrix.
 
-        for row_num, row in enumerate(reader, start=1):
-            try:
-                # Extract depth
-                depth = Decimal(str(row["depth"]))
+    Parsing runs in NumPy's C tokenizer rather than per-cell Python calls.
 
-                # Extract pixel values (col1 to col200)
-                pixel_values: list[int] = []
-                for i in range(1, settings.image_original_width + 1):
-                    col_name = f"col{i}"
-                    if col_name not in row:
-                        raise ValueError(f"Missing column: {col_name}")
-                    pixel_values.append(int(row[col_name]))
+    Args:
+        lines: CSV data lines (without header)
+        usecols: Column indexes from _csv_usecols
 
-                # Convert to numpy array
-                original_array = np.array(pixel_values, dtype=np.uint8)
+    Returns:
+        tuple: (depths, pixels) arrays
 
-                # Calculate statistics
-                stats = calculate_image_statistics(original_array)
+    Raises:
+        ValueError: If any line is malformed or holds non-integer or
+            out-of-range pixels
+    """
+    data = np.loadtxt(lines, delimiter=",", usecols=usecols, ndmin=2, dtype=np.float64)
+    pixels = data[:, 1:]
+    # loadtxt accepts "nan", "inf" and "1.5"; reject them so the block falls
+    # back to the per-line path, which reports the offending row
+    if not (np.isfinite(pixels).all() and (pixels == np.floor(pixels)).all()):
+        raise ValueError("Pixel values must be integers")
+    if pixels.size and (pixels.min() < 0 or pixels.max() > 255):
+        raise ValueError("Pixel values out of uint8 range")
+    return data[:, 0], pixels.astype(np.uint8)
+
+
+def _parse_line(
+    line: str, usecols: list[int]
+) -> tuple[float, "NDArray[np.uint8]"]:
+    """Parse a single CSV line into a depth and a pixel row.
+
+    Used on the fallback path; the pixel row is filled in one pass with
+    np.fromiter instead of building an intermediate Python list. Pixels are
+    parsed with int(), so non-integer cells raise ValueError.
 
-                # Resize image
-                resized_array = resize_image(original_array, settings.image_resized_width)
+    Args:
+        line: CSV data line
+        usecols: Column indexes from _csv_usecols
 
-                # Compress both versions
-                original_compressed = compress_array(original_array)
-                resized_compressed = compress_array(resized_array)
+    Returns:
+        tuple: (depth, pixels) for the line
 
-                # Calculate compression ratios
-                original_size = len(original_array)
-                resized_size = len(resized_array)
+    Raises:
+        ValueError: If the line is malformed or holds non-integer or
+            out-of-range pixels
+    """
+    fields = line.split(",")
+    try:
+        depth = float(fields[usecols[0]])
+        values = np.fromiter(
+            (int(fields[index]) for index in usecols[1:]),
+            dtype=np.int64,
+            count=len(usecols) - 1,
+        )
+    except IndexError as e:
+        raise ValueError("Missing columns") from e
+    if values.min() < 0 or values.max() > 255:
+        raise ValueError("Pixel values out of uint8 range")
+    return depth, values.astype(np.uint8)
+
+
+def _parse_csv_lines(
+    lines: list[str], usecols: list[int], first_row: int = 1
+) -> tuple["NDArray[np.float64]", "NDArray[np.uint8]"]:
+    """Parse CSV lines, skipping malformed rows.
+
+    Tries a single vectorized parse first and only falls back to parsing
+    line by line when the block contains a malformed row.
 
-                original_ratio = calculate_compression_ratio(
-                    original_size, len(original_compressed)
-                )
-                resized_ratio = calculate_compression_ratio(
-                    resized_size, len(resized_compressed)
-                )
+    Args:
+        lines: CSV data lines (without header)
+        usecols: Column indexes from _csv_usecols
+        first_row: Row number of the first line, for error messages
 
-                # Add compression ratios to metadata
-                metadata = {
-                    **stats,
-                    "compression_ratio_original": original_ratio,
-                    "compression_ratio_resized": resized_ratio,
-                }
-
-                # Create frame object
-                frame = ImageFrame(
-                    depth=depth,
-                    original_data=original_compressed,
-                    resized_data=resized_compressed,
-                    frame_metadata=metadata,
-                )
+    Returns:
+        tuple: (depths, pixels) arrays for all valid rows
+    """
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return (
+            np.empty(0, dtype=np.float64),
+            np.empty((0, len(usecols) - 1), dtype=np.uint8),
+        )
+
+    try:
+        return _parse_rows(lines, usecols)
+    except ValueError:
+        pass
+
+    depths: list[float] = []
+    pixels: list[NDArray[np.uint8]] = []
+    for row_num, line in enumerate(lines, start=first_row):
+        try:
+            row_depth, row_pixels = _parse_line(line, usecols)
+        except ValueError as e:
+            print(f"Error processing row {row_num}: {e}", file=sys.stderr)
+            continue
+        depths.append(row_depth)
+        pixels.append(row_pixels)
+
+    if not depths:
+        return (
+            np.empty(0, dtype=np.float64),
+            np.empty((0, len(usecols) - 1), dtype=np.uint8),
+        )
+    return np.array(depths, dtype=np.float64), np.stack(pixels)
+
+
+def _process_rows(
+    depths: "NDArray[np.float64]", pixels: "NDArray[np.uint8]", first_row: int
+) -> list[tuple[Decimal, bytes, bytes, str]]:
+    """Compute statistics, resize and compress a slice of frames.
+
+    Runs in a worker process; failed rows are reported and skipped.
+
+    Args:
+        depths: Depth values for the slice
+        pixels: (N, width) pixel matrix for the slice
+        first_row: Row number of the first frame, for error messages
 
-                frames_to_insert.append(frame)
-
-                # Batch insert
-                if len(frames_to_insert) >= batch_size:
-                    async with db_client.session() as session:
-                        session.add_all(frames_to_insert)
-                        await session.commit()
-                    total_processed += len(frames_to_insert)
-                    print(
-                        f"Processed {total_processed}/{row_count} rows "
-                        f"({total_processed/row_count*100:.1f}%)"
+    Returns:
+        list: COPY records (depth, original_data, resized_data, metadata_json)
+    """
+    # Depths go to COPY as Decimals built from each float's shortest repr,
+    # which is the CSV text, so PostgreSQL rounds the exact decimal value to
+    # the column's NUMERIC(10, 2) scale. asyncpg would otherwise build
+    # Decimal(float), whose binary expansion can round half-cents down.
+    depth_values = [Decimal(repr(depth)) for depth in depths.tolist()]
+
+    # All rows share one width, so the whole slice is resized in one call
+    resized_rows = resize_image_batch(pixels, settings.image_resized_width)
+
+    kept_depths: list[Decimal] = []
+    originals: list[NDArray[np.uint8]] = []
+    resized: list[NDArray[np.uint8]] = []
+    stats: list[dict[str, float]] = []
+
+    for row_num, (depth, pixel_row, row_resized) in enumerate(
+        zip(depth_values, pixels, resized_rows, strict=True), start=first_row
+    ):
+        try:
+            row_stats = calculate_image_statistics(pixel_row)
+        except Exception as e:
+            print(f"Error processing row {row_num}: {e}", file=sys.stderr)
+            continue
+        kept_depths.append(depth)
+        originals.append(pixel_row)
+        resized.append(row_resized)
+        stats.append(row_stats)
+
+    # Compress originals; resized rows are small enough to store raw
+    originals_compressed = compress_many(originals)
+    resized_compressed = [pack_array(small) for small in resized]
+
+    records: list[tuple[Decimal, bytes, bytes, str]] = []
+    for depth, original, original_data, resized_data, frame_stats in zip(
+        kept_depths,
+        originals,
+        originals_compressed,
+        resized_compressed,
+        stats,
+        strict=True,
+    ):
+        # Add compression ratios to metadata; resized rows are stored
+        # uncompressed, so their ratio is 1.0 rather than a header-skewed value
+        metadata = {
+            **frame_stats,
+            "compression_ratio_original": calculate_compression_ratio(
+                len(original), len(original_data)
+            ),
+            "compression_ratio_resized": 1.0,
+        }
+        records.append((depth, original_data, resized_data, json.dumps(metadata)))
+
+    return records
+
+
+async def _begin_bulk_load() -> bool:
+    """Switch an empty image_frames table into bulk-load mode.
+
+    The table is made UNLOGGED and its indexes are dropped, so COPY writes
+    heap pages only, without WAL or index maintenance. Tables that already
+    hold data are left alone: PostgreSQL truncates UNLOGGED tables after a
+    crash, which would lose the existing rows.
+
+    Returns:
+        bool: True if bulk-load mode was enabled
+    """
+    if db_client._engine is None:
+        raise RuntimeError("Database client not initialized")
+
+    async with db_client._engine.begin() as conn:
+        result = await conn.execute(text("SELECT EXISTS (SELECT 1 FROM image_frames)"))
+        if result.scalar():
+            return False
+
+        await conn.execute(text("ALTER TABLE image_frames SET UNLOGGED"))
+        for index in FRAMES_TABLE.indexes:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+    print("Bulk-load mode: table set UNLOGGED, indexes dropped")
+    return True
+
+
+async def _bulk_load_interrupted() -> bool:
+    """Check whether a previous bulk load left image_frames UNLOGGED.
+
+    A killed ingest (SIGKILL, OOM) never reaches _end_bulk_load, leaving the
+    table UNLOGGED and without its indexes. The next run sees a non-empty
+    table and would not enter bulk-load mode, so nothing else restores it.
+
+    Returns:
+        bool: True if image_frames is still UNLOGGED
+    """
+    if db_client._engine is None:
+        raise RuntimeError("Database client not initialized")
+
+    async with db_client._engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT relpersistence = 'u' FROM pg_class "
+                "WHERE oid = 'image_frames'::regclass"
+            )
+        )
+        return bool(result.scalar())
+
+
+async def _end_bulk_load() -> None:
+    """Restore logging and indexes after a bulk load."""
+    if db_client._engine is None:
+        raise RuntimeError("Database client not initialized")
+
+    def create_indexes(sync_conn: Connection) -> None:
+        for index in FRAMES_TABLE.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    async with db_client._engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE image_frames SET LOGGED"))
+        await conn.run_sync(create_indexes)
+
+    print("Bulk-load mode: table set LOGGED, indexes rebuilt")
+
+
+async def _ingest_batches(csv_path: Path, batch_size: int) -> int:
+    """Stream the CSV through the worker pool and COPY each batch.
+
+    Args:
+        csv_path: Path to CSV file
+        batch_size: Number of CSV lines to parse and COPY per batch
+
+    Returns:
+        int: Number of frames ingested
+    """
+    file_size = csv_path.stat().st_size
+    total_processed = 0
+
+    print(f"Processing {csv_path} ({file_size / 1_000_000:.1f} MB)...")
+
+    loop = asyncio.get_running_loop()
+    workers = os.cpu_count() or 1
+
+    with (
+        open(csv_path, "r", encoding="utf-8") as f,
+        ProcessPoolExecutor(max_workers=workers) as pool,
+    ):
+        usecols = _csv_usecols(f.readline())
+        bytes_read = 0
+        first_row = 1
+        pending_copy: asyncio.Task[None] | None = None
+
+        try:
+            # Stream the file one batch of lines at a time
+            while lines := list(islice(f, batch_size)):
+                bytes_read += sum(len(line) for line in lines)
+                depths, pixels = _parse_csv_lines(lines, usecols, first_row)
+
+                # Split the batch into one contiguous slice per worker
+                bounds = np.linspace(0, len(depths), workers + 1, dtype=np.int64)
+                futures = [
+                    loop.run_in_executor(
+                        pool,
+                        _process_rows,
+                        depths[start:stop],
+                        pixels[start:stop],
+                        first_row + int(start),
                     )
-                    frames_to_insert.clear()
-
-            except Exception as e:
-                print(f"Error processing row {row_num}: {e}", file=sys.stderr)
-                continue
-
-        # Insert remaining frames
-        if frames_to_insert:
-            async with db_client.session() as session:
-                session.add_all(frames_to_insert)
-                await session.commit()
-            total_processed += len(frames_to_insert)
+                    for start, stop in zip(bounds[:-1], bounds[1:], strict=True)
+                    if stop > start
+                ]
+                records = [
+                    record for chunk in await asyncio.gather(*futures) for record in chunk
+                ]
+                first_row += len(lines)
+
+                # Keep one COPY in flight while the next batch is processed
+                if pending_copy is not None:
+                    await pending_copy
+                    pending_copy = None
+                if records:
+                    pending_copy = asyncio.create_task(
+                        db_client.copy_records("image_frames", records, COPY_COLUMNS)
+                    )
+                total_processed += len(records)
+                print(
+                    f"Processed {total_processed} rows "
+                    f"(~{min(bytes_read / file_size, 1.0) * 100:.1f}% of file)"
+                )
+
+            if pending_copy is not None:
+                await pending_copy
+        finally:
+            # Wait for a cancelled COPY to unwind so it releases its connection
+            # and table lock before bulk-load cleanup alters the table
+            if pending_copy is not None and not pending_copy.done():
+                pending_copy.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await pending_copy
+
+    return total_processed
+
+
+async def process_csv_file(csv_path: Path, batch_size: int = 10_000) -> None:
+    """Process CSV file and ingest image frames into database.
+
+    The file is streamed in batches of ``batch_size`` lines. Frame processing
+    is spread over a process pool, one slice per worker for each batch, and
+    each batch's COPY runs while the next batch is being processed. Loads
+    into an empty table skip WAL and index maintenance until the end.
+
+    Args:
+        csv_path: Path to CSV file
+        batch_size: Number of CSV lines to parse and COPY per batch
+
+    Raises:
+        FileNotFoundError: If CSV file doesn't exist
+        ValueError: If CSV format is invalid
+    """
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    # Initialize database
+    db_client.initialize()
+    await db_client.create_tables()
+
+    if await _bulk_load_interrupted():
+        print("Previous bulk load was interrupted; restoring table")
+        await _end_bulk_load()
+
+    bulk_load = await _begin_bulk_load()
+    try:
+        total_processed = await _ingest_batches(csv_path, batch_size)
+    finally:
+        # Restore logging and indexes even if ingestion failed midway
+        if bulk_load:
+            await _end_bulk_load()
 
     print(f"\nIngestion complete! Processed {total_processed} frames.")
     await db_client.close()
@@ -2,16 +2,18 @@
 -- This file is for reference. Tables are created automatically via SQLAlchemy.
 
 CREATE TABLE IF NOT EXISTS image_frames (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     depth NUMERIC(10, 2) NOT NULL,
     original_data BYTEA NOT NULL,
     resized_data BYTEA NOT NULL,
     metadata JSONB NOT NULL
 );
 
--- Index on depth for efficient range queries
-CREATE INDEX IF NOT EXISTS idx_depth_range ON image_frames(depth);
+-- BRIN index on depth for range queries over depth-ordered data
+CREATE INDEX IF NOT EXISTS idx_depth_range_brin ON image_frames
+    USING brin (depth) WITH (pages_per_range = 32);
 
--- Additional index for depth ordering
-CREATE INDEX IF NOT EXISTS idx_depth_asc ON image_frames(depth ASC);
+-- B-tree on depth for ORDER BY depth LIMIT (same name as the ORM's index=True
+-- index, so ingest's index rebuild does not create a second copy)
+CREATE INDEX IF NOT EXISTS ix_image_frames_depth ON image_frames(depth);
 
@@ -1,7 +1,8 @@
 """Database client singleton for async database operations."""
 
+from collections.abc import Iterable, Sequence
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
@@ -32,8 +33,15 @@ class DatabaseClient:
             settings.database_url,
             pool_size=settings.database_pool_size,
             max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
             pool_pre_ping=True,
             echo=False,
+            # SQLAlchemy's asyncpg dialect keeps its own per-connection cache of
+            # prepared statements (e.g. the depth-range SELECT); default 100
+            connect_args={
+                "prepared_statement_cache_size": settings.database_prepared_statement_cache_size,
+            },
         )
         self._session_factory = async_sessionmaker(
             bind=self._engine,
@@ -74,6 +82,44 @@ class DatabaseClient:
         finally:
             await session.close()
 
+    async def copy_records(
+        self,
+        table_name: str,
+        records: Iterable[Sequence[Any]],
+        columns: Sequence[str],
+    ) -> None:
+        """Bulk load records into a table using PostgreSQL COPY.
+
+        Bypasses the ORM and streams records over the raw asyncpg connection,
+        avoiding per-row INSERT parse/plan overhead.
+
+        Args:
+            table_name: Name of the target table
+            records: Iterable of row tuples, ordered as ``columns``
+            columns: Target column names
+
+        Raises:
+            RuntimeError: If the pooled connection has no driver connection
+
+        Example:
+            await db_client.copy_records(
+                "image_frames",
+                [(Decimal("9000.1"), b"...", b"...", '{"min": 0.0}')],
+                columns=["depth", "original_data", "resized_data", "metadata"],
+            )
+        """
+        async with self.session() as session:
+            conn = await session.connection()
+            raw_conn = await conn.get_raw_connection()
+            driver_conn = raw_conn.driver_connection
+            if driver_conn is None:
+                raise RuntimeError("Database connection has no driver connection")
+            await driver_conn.copy_records_to_table(
+                table_name,
+                records=records,
+                columns=list(columns),
+            )
+
     async def close(self) -> None:
         """Close database engine and cleanup resources."""
         if self._engine is not None:
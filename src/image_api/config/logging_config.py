@@ -3,13 +3,43 @@
 import json
 import logging
 import sys
+import time
 from typing import Any
 
+import orjson
+
 from image_api.config.settings import settings
 
 
 class JSONFormatter(logging.Formatter):
-    """JSON formatter for structured logging."""
+    """JSON formatter for structured logging.
+
+    Records are serialized with orjson, falling back to the standard json
+    module for values orjson rejects (such as integers beyond 64 bits). The
+    second-resolution part of the default timestamp is reused for records
+    logged within the same second.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize formatter with an empty timestamp cache."""
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted "%Y-%m-%d %H:%M:%S") of the last record
+        self._time_cache: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        """Format record time, caching the per-second strftime result."""
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, cached_text = self._time_cache
+        if second != cached_second:
+            cached_text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._time_cache = (second, cached_text)
+
+        if self.default_msec_format:
+            return self.default_msec_format % (cached_text, record.msecs)
+        return cached_text
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
@@ -31,7 +61,12 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_fields"):
             log_data.update(record.extra_fields)
 
-        return json.dumps(log_data)
+        try:
+            return orjson.dumps(
+                log_data, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except TypeError:
+            return json.dumps(log_data, default=str)
 
 
 def setup_logging() -> None:
@@ -1,23 +1,45 @@
 """Frame endpoints for image data."""
 
 import logging
+from collections.abc import AsyncIterator
 from decimal import Decimal
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from image_api.clients.database import db_client
-from image_api.models.schemas import FrameQueryParams, FrameResponse
+from image_api.config.settings import settings
+from image_api.models.database import ImageFrame
+from image_api.models.schemas import ColormapName, FrameQueryParams, FrameResponse
 from image_api.utilities.compression import decompress_array
-from image_api.utilities.database_ops import get_frames_buffered
+from image_api.utilities.database_ops import get_frame_batches
 from image_api.utilities.image_processing import (
     apply_colormap,
     encode_rgb_to_base64,
+    render_colormap_base64,
 )
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 router = APIRouter(prefix="/frames", tags=["frames"])
 
+logger = logging.getLogger(__name__)
+
+# Serialized responses keyed by (depth_min, depth_max, colormap, limit). Sized
+# by body length, since one unlimited range can be several MB on its own.
+FramesCacheKey = tuple[Decimal, Decimal, str, int | None]
+_frames_cache: TTLCache[FramesCacheKey, bytes] = TTLCache(
+    maxsize=max(settings.frames_cache_max_bytes, 1),
+    ttl=settings.frames_cache_ttl_seconds,
+    getsizeof=len,
+)
+
 
 async def get_session() -> AsyncSession:
     """Dependency to get database session."""
@@ -25,6 +47,129 @@ async def get_session() -> AsyncSession:
         yield session
 
 
+def _validate_params(
+    depth_min: Decimal,
+    depth_max: Decimal,
+    colormap: str,
+    limit: int | None,
+) -> FrameQueryParams:
+    """Validate frame query parameters, mapping errors to HTTP 400."""
+    try:
+        return FrameQueryParams(
+            depth_min=depth_min,
+            depth_max=depth_max,
+            colormap=colormap,  # type: ignore[arg-type]
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _decode_frame(frame: ImageFrame) -> "NDArray[np.uint8]":
+    """Decompress and validate the resized grayscale row of a frame.
+
+    Raises:
+        ValueError: If the stored frame data is invalid
+    """
+    # Validate that resized_data is bytes
+    if not isinstance(frame.resized_data, bytes):
+        raise ValueError(f"Invalid data type for resized_data: {type(frame.resized_data)}")
+
+    # Decompress resized data
+    grayscale = decompress_array(frame.resized_data)
+
+    # Validate decompressed data
+    if grayscale.size == 0:
+        raise ValueError("Decompressed array is empty")
+    if grayscale.dtype != np.uint8:
+        raise ValueError(f"Invalid dtype after decompression: {grayscale.dtype}")
+
+    return grayscale
+
+
+def _render_frames(frames: list[ImageFrame], colormap: ColormapName) -> list[dict[str, Any]]:
+    """Decompress, colormap and encode a batch of frames.
+
+    Rows are stacked into one (frames, width) array and colormapped straight
+    to base64 with a single table gather. Invalid frames are logged and
+    skipped.
+
+    Args:
+        frames: Image frame rows
+        colormap: Colormap name to apply
+
+    Returns:
+        list[dict]: FrameResponse-shaped data for all valid frames
+    """
+    valid_frames: list[ImageFrame] = []
+    rows: list[NDArray[np.uint8]] = []
+    for frame in frames:
+        try:
+            rows.append(_decode_frame(frame))
+            valid_frames.append(frame)
+        except Exception as e:
+            # Log error and skip this frame instead of failing the entire request
+            logger.error(
+                f"Error processing frame depth={frame.depth}: {e}",
+                exc_info=True,
+            )
+
+    if not rows:
+        return []
+
+    # Mixed widths cannot be stacked; fall back to one frame at a time
+    if len({row.shape[0] for row in rows}) > 1:
+        results: list[dict[str, Any]] = []
+        for frame in valid_frames:
+            try:
+                results.append(_process_frame(frame, colormap))
+            except Exception as e:
+                logger.error(
+                    f"Error processing frame depth={frame.depth}: {e}",
+                    exc_info=True,
+                )
+        return results
+
+    encoded = render_colormap_base64(np.stack(rows), colormap)
+
+    return [
+        {"depth": float(frame.depth), "data": data, "metadata": frame.frame_metadata}
+        for frame, data in zip(valid_frames, encoded, strict=True)
+    ]
+
+
+def _process_frame(frame: ImageFrame, colormap: ColormapName) -> dict[str, Any]:
+    """Decompress, colormap and encode a single frame.
+
+    Args:
+        frame: Image frame row
+        colormap: Colormap name to apply
+
+    Returns:
+        dict: FrameResponse-shaped frame data
+
+    Raises:
+        ValueError: If the stored frame data is invalid
+    """
+    grayscale = _decode_frame(frame)
+
+    # Apply colormap
+    rgb = apply_colormap(grayscale, colormap)
+
+    # Validate RGB array
+    if rgb.shape[2] != 3:
+        raise ValueError(f"Invalid RGB shape: {rgb.shape}")
+
+    # Encode to base64
+    data = encode_rgb_to_base64(rgb)
+
+    # Validate base64 encoding
+    if not data or not isinstance(data, str):
+        raise ValueError("Base64 encoding failed or returned invalid result")
+
+    return {"depth": float(frame.depth), "data": data, "metadata": frame.frame_metadata}
+
+
 @router.get("", response_model=list[FrameResponse])
 async def get_frames(
     depth_min: Decimal = Query(..., description="Minimum depth value"),
@@ -37,9 +182,13 @@ async def get_frames(
         default=None, ge=1, le=10000, description="Maximum number of frames"
     ),
     session: AsyncSession = Depends(get_session),
-) -> list[FrameResponse]:
+) -> Response:
     """Get image frames as JSON array.
 
+    The body is serialized with orjson and returned directly, so FastAPI
+    does not re-validate it against ``response_model`` (which still
+    documents the schema).
+
     Args:
         depth_min: Minimum depth value
         depth_max: Maximum depth value
@@ -48,86 +197,84 @@ async def get_frames(
         session: Database session
 
     Returns:
-        list[FrameResponse]: List of frame data
+        Response: JSON array of FrameResponse objects
 
     Raises:
         HTTPException: If query parameters are invalid
     """
-    # Validate query parameters
-    try:
-        params = FrameQueryParams(
-            depth_min=depth_min,
-            depth_max=depth_max,
-            colormap=colormap,  # type: ignore[arg-type]
-            limit=limit,
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e)) from e
+    params = _validate_params(depth_min, depth_max, colormap, limit)
+
+    # Repeated ranges (scroll/zoom) skip the database and rendering entirely
+    cache_key = (params.depth_min, params.depth_max, params.colormap, params.limit)
+    if settings.frames_cache_max_bytes > 0:
+        cached = _frames_cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
 
-    # Get all frames
-    frames = await get_frames_buffered(
+    # Render each cursor batch as it arrives; only one batch of rows (with
+    # their stored BLOBs) is held at a time
+    frames_data: list[dict[str, Any]] = []
+    async for batch in get_frame_batches(
         session,
         params.depth_min,
         params.depth_max,
         params.limit,
-    )
+    ):
+        frames_data.extend(_render_frames(batch, params.colormap))
 
-    # Process frames
-    results: list[FrameResponse] = []
-    for frame in frames:
-        try:
-            # Validate that resized_data is bytes
-            if not isinstance(frame.resized_data, bytes):
-                raise ValueError(
-                    f"Invalid data type for resized_data: {type(frame.resized_data)}"
-                )
+    body = orjson.dumps(frames_data)
 
-            # Decompress resized data
-            grayscale = decompress_array(frame.resized_data)
+    # Bodies larger than the whole budget are served but not cached
+    if settings.frames_cache_max_bytes > 0 and len(body) <= _frames_cache.maxsize:
+        _frames_cache[cache_key] = body
 
-            # Validate decompressed data
-            if grayscale.size == 0:
-                raise ValueError("Decompressed array is empty")
-            if grayscale.dtype != np.uint8:
-                raise ValueError(f"Invalid dtype after decompression: {grayscale.dtype}")
+    return Response(content=body, media_type="application/json")
 
-            # Apply colormap
-            rgb = apply_colormap(grayscale, params.colormap)
 
-            # Validate RGB array
-            if rgb.shape[2] != 3:
-                raise ValueError(f"Invalid RGB shape: {rgb.shape}")
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_frames(
+    depth_min: Decimal = Query(..., description="Minimum depth value"),
+    depth_max: Decimal = Query(..., description="Maximum depth value"),
+    colormap: str = Query(
+        default="viridis",
+        description="Colormap name (viridis, plasma, hot, cool, etc.)",
+    ),
+    limit: int | None = Query(
+        default=None, ge=1, le=10000, description="Maximum number of frames"
+    ),
+) -> StreamingResponse:
+    """Stream image frames as newline-delimited JSON (NDJSON).
 
-            # Encode to base64
-            data = encode_rgb_to_base64(rgb)
+    Frames are read from a server-side cursor and rendered a batch at a
+    time as they arrive, so memory use is constant and the first frames are
+    sent without waiting for the whole range.
 
-            # Validate base64 encoding
-            if not data or not isinstance(data, str):
-                raise ValueError("Base64 encoding failed or returned invalid result")
+    Args:
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+        colormap: Colormap name to apply
+        limit: Optional maximum number of frames
 
-            # Get metadata (frame_metadata is the attribute, metadata is the column name)
-            metadata_dict = (
-                frame.frame_metadata
-                if isinstance(frame.frame_metadata, dict)
-                else dict(frame.frame_metadata)
-            )
+    Returns:
+        StreamingResponse: One FrameResponse JSON object per line
 
-            # Create response
-            response = FrameResponse(
-                depth=float(frame.depth),
-                data=data,
-                metadata=metadata_dict,
-            )
-            results.append(response)
-        except Exception as e:
-            # Log error and skip this frame
-            logger = logging.getLogger(__name__)
-            logger.error(
-                f"Error processing frame depth={frame.depth}: {e}",
-                exc_info=True,
-            )
-            # Skip this frame instead of failing the entire request
-            continue
+    Raises:
+        HTTPException: If query parameters are invalid
+    """
+    params = _validate_params(depth_min, depth_max, colormap, limit)
 
-    return results
+    async def generate() -> AsyncIterator[bytes]:
+        # The session is owned by the generator so it stays open while streaming
+        async with db_client.session() as session:
+            async for batch in get_frame_batches(
+                session,
+                params.depth_min,
+                params.depth_max,
+                params.limit,
+            ):
+                # One vectorized render and one chunk per cursor batch
+                frames_data = _render_frames(batch, params.colormap)
+                if frames_data:
+                    yield b"".join(orjson.dumps(data) + b"\n" for data in frames_data)
 
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
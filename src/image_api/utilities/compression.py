@@ -1,19 +1,120 @@
-"""Compression utilities for image data using gzip level 9."""
+"""Compression utilities for image data.
+
+Arrays are stored as a 1-byte codec tag, a shape header and the codec
+payload of the raw uint8 bytes. Codecs read the array's buffer directly,
+with no tobytes() copy or BytesIO staging. Data written before codec tags
+existed is a bare gzip-compressed NPY stream and is still decoded.
+"""
 
 import gzip
 import io
+import struct
+import zlib
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
+import blosc2
 import numpy as np
+import zstandard
 
 from image_api.config.settings import settings
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
+# Codec tags (first byte of tagged data)
+CODEC_RAW = 0x00
+CODEC_BLOSC2 = 0x01
+CODEC_ZSTD = 0x02
+CODEC_GZIP = 0x03
+
+# Magic bytes of the untagged gzip/NPY format
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# zlib window bits selecting a gzip container
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# Codec tag and number of dimensions, followed by one uint32 per dimension
+_HEADER = struct.Struct("<BB")
+_DIM = struct.Struct("<I")
+
+
+def _pack_header(codec: int, shape: tuple[int, ...]) -> bytes:
+    """Build the codec tag and shape header for tagged data."""
+    return _HEADER.pack(codec, len(shape)) + b"".join(_DIM.pack(dim) for dim in shape)
+
+
+def _unpack_header(data: bytes) -> tuple[int, tuple[int, ...], int]:
+    """Parse the header of tagged data.
+
+    Returns:
+        tuple: (codec tag, shape, payload offset)
+    """
+    codec, ndim = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    shape = tuple(_DIM.unpack_from(data, offset + i * _DIM.size)[0] for i in range(ndim))
+    return codec, shape, offset + ndim * _DIM.size
+
+
+def _compress_blosc2(array: "NDArray[np.uint8]") -> bytes:
+    """Compress array with Blosc2 (shuffle + LZ4) behind a tagged header."""
+    contiguous = np.ascontiguousarray(array, dtype=np.uint8)
+    payload = blosc2.compress2(
+        contiguous.data,
+        typesize=1,
+        clevel=settings.compression_level,
+        filter=blosc2.Filter.SHUFFLE,
+        codec=blosc2.Codec.LZ4,
+    )
+    return _pack_header(CODEC_BLOSC2, contiguous.shape) + bytes(payload)
+
+
+def _zstd_compressor() -> zstandard.ZstdCompressor:
+    """Create a zstd compressor for the configured level.
+
+    threads=-1 enables multi-threaded compression; zstd only splits inputs
+    larger than its job size, so small frames stay single-threaded.
+    """
+    return zstandard.ZstdCompressor(level=settings.compression_level, threads=-1)
+
+
+def _compress_zstd(
+    array: "NDArray[np.uint8]", compressor: zstandard.ZstdCompressor | None = None
+) -> bytes:
+    """Compress array with zstd behind a tagged header."""
+    contiguous = np.ascontiguousarray(array, dtype=np.uint8)
+    payload = (compressor or _zstd_compressor()).compress(contiguous.data)
+    return _pack_header(CODEC_ZSTD, contiguous.shape) + payload
+
+
+def _compress_gzip(array: "NDArray[np.uint8]") -> bytes:
+    """Compress array with gzip behind a tagged header.
+
+    A single zlib call writes the gzip container directly, avoiding the
+    BytesIO/GzipFile buffering layer.
+    """
+    contiguous = np.ascontiguousarray(array, dtype=np.uint8)
+    payload = zlib.compress(contiguous.data, settings.compression_level, _GZIP_WBITS)
+    return _pack_header(CODEC_GZIP, contiguous.shape) + payload
+
+
+def _smaller_than_raw(array: "NDArray[np.uint8]", compressed: bytes) -> bytes:
+    """Return compressed data, or the raw tagged form if that is not larger.
+
+    Small or noisy rows often do not compress; storing them raw keeps every
+    row at most header + nbytes and makes decoding a zero-copy view.
+    """
+    raw_size = _HEADER.size + array.ndim * _DIM.size + array.size
+    if len(compressed) < raw_size:
+        return compressed
+    return pack_array(array)
+
 
 def compress_array(array: "NDArray[np.uint8]") -> bytes:
-    """Compress NumPy array using gzip level 9 (maximum compression).
+    """Compress NumPy array using the configured codec.
+
+    Falls back to the uncompressed tagged form (as pack_array) when the
+    codec does not make the array smaller.
 
     Args:
         array: NumPy array of uint8 values to compress
@@ -28,26 +129,69 @@ def compress_array(array: "NDArray[np.uint8]") -> bytes:
         >>> np.array_equal(arr, decompressed)
         True
     """
-    buffer = io.BytesIO()
+    if settings.compression_codec == "gzip":
+        compressed = _compress_gzip(array)
+    elif settings.compression_codec == "zstd":
+        compressed = _compress_zstd(array)
+    else:
+        compressed = _compress_blosc2(array)
+    return _smaller_than_raw(array, compressed)
 
-    with gzip.GzipFile(
-        fileobj=buffer,
-        mode="wb",
-        compresslevel=settings.compression_level,
-    ) as gz:
-        np.save(gz, array, allow_pickle=False)
 
-    return buffer.getvalue()
+def compress_many(arrays: Sequence["NDArray[np.uint8]"]) -> list[bytes]:
+    """Compress many arrays, amortizing per-array setup.
+
+    Produces the same format as compress_array. For zstd one compressor
+    is reused across the batch.
+
+    Args:
+        arrays: NumPy arrays of uint8 values to compress
+
+    Returns:
+        list[bytes]: Compressed binary data, one entry per input array
+
+    Example:
+        >>> arrays = [np.array([1, 2, 3], dtype=np.uint8)] * 2
+        >>> compressed = compress_many(arrays)
+        >>> np.array_equal(arrays[0], decompress_array(compressed[0]))
+        True
+    """
+    if settings.compression_codec == "zstd":
+        compressor = _zstd_compressor()
+        return [_smaller_than_raw(array, _compress_zstd(array, compressor)) for array in arrays]
+    return [compress_array(array) for array in arrays]
+
+
+def pack_array(array: "NDArray[np.uint8]") -> bytes:
+    """Store NumPy array uncompressed, in the tagged format.
+
+    Meant for small arrays where compression costs more CPU than the bytes
+    it saves; decompress_array reads the result as a zero-copy view.
+
+    Args:
+        array: NumPy array of uint8 values
+
+    Returns:
+        bytes: Tagged raw binary data
+
+    Example:
+        >>> arr = np.array([1, 2, 3], dtype=np.uint8)
+        >>> np.array_equal(arr, decompress_array(pack_array(arr)))
+        True
+    """
+    contiguous = np.ascontiguousarray(array, dtype=np.uint8)
+    return _pack_header(CODEC_RAW, contiguous.shape) + contiguous.data
 
 
 def decompress_array(compressed_data: bytes) -> "NDArray[np.uint8]":
-    """Decompress NumPy array from gzip-compressed data.
+    """Decompress NumPy array from data produced by compress_array.
 
     Args:
         compressed_data: Compressed binary data from compress_array
 
     Returns:
-        NDArray[np.uint8]: Decompressed NumPy array
+        NDArray[np.uint8]: Decompressed NumPy array, a read-only view over
+            the decompressed buffer (copy it before modifying)
 
     Raises:
         ValueError: If decompression fails or data is invalid
@@ -59,13 +203,46 @@ def decompress_array(compressed_data: bytes) -> "NDArray[np.uint8]":
         >>> np.array_equal(arr, decompressed)
         True
     """
-    buffer = io.BytesIO(compressed_data)
+    if compressed_data[:2] == _GZIP_MAGIC:
+        try:
+            raw = gzip.decompress(compressed_data)
+            # Parse the NPY header only and view the data in place, rather
+            # than letting np.load copy it out of a BytesIO
+            buffer = io.BytesIO(raw)
+            if np.lib.format.read_magic(buffer) == (1, 0):
+                header = np.lib.format.read_array_header_1_0(buffer)
+            else:
+                header = np.lib.format.read_array_header_2_0(buffer)
+            shape, fortran_order, dtype = header
+            array = np.frombuffer(raw, dtype=dtype, offset=buffer.tell())
+            array = array.reshape(shape, order="F" if fortran_order else "C")
+            return array.astype(np.uint8, copy=False)
+        except (OSError, EOFError, zlib.error, ValueError) as e:
+            raise ValueError(f"Failed to decompress array: {e}") from e
 
     try:
-        with gzip.GzipFile(fileobj=buffer, mode="rb") as gz:
-            array = np.load(gz, allow_pickle=False)
-            return array.astype(np.uint8)
-    except (gzip.BadGzipFile, OSError, ValueError) as e:
+        codec, shape, offset = _unpack_header(compressed_data)
+        if codec == CODEC_RAW:
+            return np.frombuffer(compressed_data, dtype=np.uint8, offset=offset).reshape(shape)
+        # Hand the payload to the codec as a view instead of slicing a copy
+        payload = memoryview(compressed_data)[offset:]
+        if codec == CODEC_BLOSC2:
+            raw = blosc2.decompress2(payload)
+        elif codec == CODEC_ZSTD:
+            raw = zstandard.ZstdDecompressor().decompress(payload)
+        elif codec == CODEC_GZIP:
+            raw = zlib.decompress(payload, _GZIP_WBITS)
+        else:
+            raise ValueError(f"unknown codec tag {codec:#04x}")
+        return np.frombuffer(raw, dtype=np.uint8).reshape(shape)
+    except (
+        struct.error,
+        RuntimeError,
+        ValueError,
+        OSError,
+        zlib.error,
+        zstandard.ZstdError,
+    ) as e:
         raise ValueError(f"Failed to decompress array: {e}") from e
 
 
@@ -1,17 +1,44 @@
 """Database operations for image frames."""
 
+from collections.abc import AsyncIterator, Sequence
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 
+from image_api.config.settings import settings
 from image_api.models.database import ImageFrame
 
 if TYPE_CHECKING:
     from image_api.models.database import ImageFrame as ImageFrameType
 
 
+async def _stream_frames(
+    session: AsyncSession,
+    depth_min: Decimal,
+    depth_max: Decimal,
+    limit: int | None = None,
+) -> AsyncScalarResult["ImageFrameType"]:
+    """Run the depth-range query shared by the frame readers.
+
+    Rows come from a server-side cursor in chunks of
+    ``settings.stream_batch_size``.
+    """
+    query = (
+        select(ImageFrame)
+        .where(ImageFrame.depth >= depth_min)
+        .where(ImageFrame.depth <= depth_max)
+        .order_by(ImageFrame.depth)
+        .execution_options(yield_per=settings.stream_batch_size)
+    )
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    return await session.stream_scalars(query)
+
+
 async def get_frames_buffered(
     session: AsyncSession,
     depth_min: Decimal,
@@ -20,6 +47,10 @@ async def get_frames_buffered(
 ) -> list["ImageFrameType"]:
     """Get all frames in memory (for buffered endpoint).
 
+    Rows are still fetched from a server-side cursor in chunks of
+    ``settings.stream_batch_size``, so the driver never holds the whole
+    result set in one buffer while the list is built.
+
     Args:
         session: Database session
         depth_min: Minimum depth value
@@ -34,18 +65,39 @@ async def get_frames_buffered(
         ...     frames = await get_frames_buffered(session, Decimal("9000"), Decimal("10000"))
         ...     print(len(frames))
     """
-    query = (
-        select(ImageFrame)
-        .where(ImageFrame.depth >= depth_min)
-        .where(ImageFrame.depth <= depth_max)
-        .order_by(ImageFrame.depth)
-    )
+    result = await _stream_frames(session, depth_min, depth_max, limit)
+    return [frame async for frame in result]
 
-    if limit is not None:
-        query = query.limit(limit)
 
-    result = await session.execute(query)
-    return list(result.scalars().all())
+async def get_frame_batches(
+    session: AsyncSession,
+    depth_min: Decimal,
+    depth_max: Decimal,
+    limit: int | None = None,
+) -> AsyncIterator[list["ImageFrameType"]]:
+    """Stream frames from a server-side cursor in batches.
+
+    Yields each fetched chunk of ``settings.stream_batch_size`` rows as a
+    list so callers can process a batch at a time without holding the whole
+    result set.
+
+    Args:
+        session: Database session
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+        limit: Optional maximum number of frames to return
+
+    Yields:
+        list[ImageFrame]: Consecutive batches of frames in depth order
+
+    Example:
+        >>> async with db_client.session() as session:
+        ...     async for batch in get_frame_batches(session, Decimal("9000"), Decimal("10000")):
+        ...         print(len(batch))
+    """
+    result = await _stream_frames(session, depth_min, depth_max, limit)
+    async for batch in result.partitions():
+        yield list(batch)
 
 
 async def create_frame(
@@ -81,9 +133,58 @@ async def create_frame(
         depth=depth,
         original_data=original_data,
         resized_data=resized_data,
-        metadata=metadata,
+        frame_metadata=metadata,
     )
     session.add(frame)
     await session.flush()
     return frame
 
+
+async def create_frames_bulk(
+    session: AsyncSession,
+    frames: Sequence[dict[str, Any]],
+) -> int:
+    """Create many image frame records with one bulk INSERT.
+
+    Rows are sent as a single executemany (batched multi-row INSERTs)
+    instead of one add/flush round trip per frame. For very large loads,
+    DatabaseClient.copy_records (PostgreSQL COPY) is faster still.
+
+    Args:
+        session: Database session
+        frames: Frame rows with keys depth, original_data, resized_data
+            and metadata, as taken by create_frame
+
+    Returns:
+        int: Number of frames inserted
+
+    Example:
+        >>> async with db_client.session() as session:
+        ...     count = await create_frames_bulk(
+        ...         session,
+        ...         [
+        ...             {
+        ...                 "depth": Decimal("9000.1"),
+        ...                 "original_data": b"compressed_original",
+        ...                 "resized_data": b"compressed_resized",
+        ...                 "metadata": {"min": 0.0, "max": 255.0},
+        ...             }
+        ...         ],
+        ...     )
+    """
+    if not frames:
+        return 0
+
+    await session.execute(
+        insert(ImageFrame),
+        [
+            {
+                "depth": frame["depth"],
+                "original_data": frame["original_data"],
+                "resized_data": frame["resized_data"],
+                "frame_metadata": frame["metadata"],
+            }
+            for frame in frames
+        ],
+    )
+    return len(frames)
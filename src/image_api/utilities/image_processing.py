@@ -1,11 +1,12 @@
 """Image processing utilities for resizing and colormap application."""
 
-import base64
-from typing import TYPE_CHECKING
+import functools
+import math
+from typing import TYPE_CHECKING, get_args
 
-import matplotlib.cm as cm
+import matplotlib
 import numpy as np
-from PIL import Image
+import pybase64
 
 from image_api.config.settings import settings
 from image_api.models.schemas import ColormapName
@@ -14,14 +15,172 @@ if TYPE_CHECKING:
     from numpy.typing import NDArray
 
 
+def _build_colormap_lut(colormap_name: str) -> "NDArray[np.uint8]":
+    """Build a (256, 3) uint8 RGB lookup table for a colormap."""
+    normalized = np.arange(256, dtype=np.float32) / 255.0
+    rgba = matplotlib.colormaps[colormap_name](normalized)
+    lut: NDArray[np.uint8] = (rgba[:, :3] * 255).astype(np.uint8)
+    # Shared across requests, so guard against accidental in-place edits
+    lut.setflags(write=False)
+    return lut
+
+
+# Grayscale input only has 256 values, so each colormap is a table lookup
+_LUTS: dict[str, "NDArray[np.uint8]"] = {
+    name: _build_colormap_lut(name) for name in get_args(ColormapName)
+}
+
+# One pixel is 3 RGB bytes, which is exactly one 4-character base64 group, so
+# colormap + base64 also collapses into a table lookup. Each group's 4 ASCII
+# bytes are packed into one uint32 so the gather moves one element per pixel.
+_B64_LUTS: dict[str, "NDArray[np.uint32]"] = {
+    name: np.frombuffer(pybase64.b64encode(lut.data), dtype=np.uint32).copy()
+    for name, lut in _LUTS.items()
+}
+
+
+# Every possible uint8 pixel value, for histogram-based statistics
+_PIXEL_VALUES = np.arange(256, dtype=np.float64)
+
+# Fixed-point precision of Pillow's 8-bit resampler (ImagingResample)
+_PRECISION_BITS = 32 - 8 - 2
+
+# Lanczos filter order (support radius in input pixels at scale 1)
+_LANCZOS_SUPPORT = 3.0
+
+
+def _lanczos_filter(x: float) -> float:
+    """Evaluate the order-3 Lanczos kernel, sinc(x) * sinc(x / 3)."""
+    if not -_LANCZOS_SUPPORT <= x < _LANCZOS_SUPPORT:
+        return 0.0
+    if x == 0.0:
+        return 1.0
+    return (
+        math.sin(math.pi * x)
+        / (math.pi * x)
+        * math.sin(math.pi * x / _LANCZOS_SUPPORT)
+        / (math.pi * x / _LANCZOS_SUPPORT)
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _lanczos_coefficients(
+    in_size: int, out_size: int, in_span: float | None = None
+) -> tuple["NDArray[np.intp]", "NDArray[np.int64]"]:
+    """Precompute Lanczos taps for resampling in_size pixels to out_size.
+
+    Mirrors Pillow's precompute_coeffs/normalize_coeffs_8bpc so results are
+    bit-identical to Image.resize(..., LANCZOS): double-precision weights
+    normalized per output pixel, then rounded to fixed point.
+
+    Args:
+        in_size: Number of input pixels
+        out_size: Number of output pixels
+        in_span: Width of the source region mapped onto the output, when it
+            is not the whole input (e.g. after a fractional pre-reduction)
+
+    Returns:
+        tuple: (indices, weights), both (out_size, taps). Taps past the
+            edge of the input carry zero weight and a clamped index.
+    """
+    scale = (in_size if in_span is None else in_span) / out_size
+    filterscale = max(scale, 1.0)
+    support = _LANCZOS_SUPPORT * filterscale
+    inv_filterscale = 1.0 / filterscale
+    taps = math.ceil(support) * 2 + 1
+
+    indices = np.zeros((out_size, taps), dtype=np.intp)
+    weights = np.zeros((out_size, taps), dtype=np.int64)
+    for xx in range(out_size):
+        center = (xx + 0.5) * scale
+        xmin = max(int(center - support + 0.5), 0)
+        xmax = min(int(center + support + 0.5), in_size) - xmin
+
+        kernel = [
+            _lanczos_filter((x + xmin - center + 0.5) * inv_filterscale) for x in range(xmax)
+        ]
+        total = sum(kernel)
+        for x, w in enumerate(kernel):
+            if total != 0.0:
+                w /= total
+            scaled = w * (1 << _PRECISION_BITS)
+            weights[xx, x] = int(scaled - 0.5) if w < 0 else int(scaled + 0.5)
+
+        indices[xx] = np.minimum(np.arange(xmin, xmin + taps), in_size - 1)
+
+    indices.setflags(write=False)
+    weights.setflags(write=False)
+    return indices, weights
+
+
+@functools.lru_cache(maxsize=32)
+def _lanczos_matrix(
+    in_size: int, out_size: int, in_span: float | None = None
+) -> "NDArray[np.float64]":
+    """Scatter the fixed-point Lanczos taps into a dense (in_size, out_size) matrix.
+
+    Weights are pre-scaled by 2**-PRECISION_BITS, an exact power-of-two
+    scaling, so a float64 matrix product reproduces Pillow's integer
+    accumulator exactly (every partial sum stays well below 2**53) while
+    running as a single BLAS call.
+    """
+    indices, weights = _lanczos_coefficients(in_size, out_size, in_span)
+
+    matrix = np.zeros((in_size, out_size), dtype=np.float64)
+    np.add.at(matrix, (indices, np.arange(out_size)[:, None]), weights)
+    matrix *= 2.0**-_PRECISION_BITS
+
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _box_multiplier(count: int) -> int:
+    """Fixed-point reciprocal Pillow's ImagingReduce uses to average count pixels.
+
+    Computed in single precision, as in Pillow's division_UINT32.
+    """
+    return int(np.float32(2.0**32) / np.float32(256 * count))
+
+
+def _box_reduce(rows: "NDArray[np.uint8]", factor: int) -> "NDArray[np.uint8]":
+    """Average every factor pixels of each row into one, as Image.reduce((factor, 1)) does.
+
+    A trailing partial block is averaged over the pixels it has.
+    """
+    width = rows.shape[1]
+    full = width // factor
+    remainder = width % factor
+
+    sums = rows[:, : full * factor].reshape(len(rows), full, factor).sum(axis=2, dtype=np.uint64)
+    reduced = ((sums + factor // 2) * _box_multiplier(factor)) >> 24
+    if remainder:
+        tail = rows[:, full * factor :].sum(axis=1, dtype=np.uint64) + remainder // 2
+        tail = (tail * _box_multiplier(remainder)) >> 24
+        reduced = np.concatenate([reduced, tail[:, None]], axis=1)
+
+    result: NDArray[np.uint8] = reduced.astype(np.uint8)
+    return result
+
+
 def resize_image(
-    image_array: "NDArray[np.uint8]", target_width: int
+    image_array: "NDArray[np.uint8]",
+    target_width: int,
+    reducing_gap: float | None = None,
 ) -> "NDArray[np.uint8]":
     """Resize image array using LANCZOS algorithm (highest quality).
 
+    A pure NumPy port of Pillow's LANCZOS resampler for single-row images:
+    output matches Image.resize bit for bit, without the PIL Image round
+    trip.
+
     Args:
         image_array: 1D array of pixel values (grayscale)
         target_width: Target width for resized image
+        reducing_gap: Optional speedup for large downscales, as in
+            Image.resize: when the image shrinks by at least twice this
+            ratio, it is first box-reduced by an integer factor and only
+            the remaining scale is done with LANCZOS. Larger values stay
+            closer to plain LANCZOS; None disables it.
 
     Returns:
         NDArray[np.uint8]: Resized 1D array of pixel values
@@ -32,26 +191,53 @@ def resize_image(
         >>> len(resized)
         150
     """
-    # Reshape to 2D (assuming single row, original width)
-    original_width = len(image_array)
-    height = 1
+    # Treat the array as a single-row batch: (1, width) -> (1, target_width)
+    resized: NDArray[np.uint8] = resize_image_batch(
+        image_array.reshape(1, -1), target_width, reducing_gap
+    )[0]
+    return resized
+
 
-    # Reshape to 2D image
-    image_2d = image_array.reshape((height, original_width))
+def resize_image_batch(
+    image_rows: "NDArray[np.uint8]",
+    target_width: int,
+    reducing_gap: float | None = None,
+) -> "NDArray[np.uint8]":
+    """Resize a stack of rows of equal width in one call.
 
-    # Convert to PIL Image
-    pil_image = Image.fromarray(image_2d, mode="L")
+    Rows are resampled independently, exactly as resize_image would, but
+    the whole stack goes through a single matrix product.
 
-    # Resize using LANCZOS (highest quality)
-    resized_image = pil_image.resize(
-        (target_width, height),
-        resample=Image.Resampling.LANCZOS,
-    )
+    Args:
+        image_rows: 2D array of pixel values (rows, width)
+        target_width: Target width for resized rows
+        reducing_gap: Optional box pre-reduction, see resize_image
 
-    # Convert back to numpy array and flatten
-    resized_array = np.array(resized_image, dtype=np.uint8).flatten()
+    Returns:
+        NDArray[np.uint8]: 2D array of resized pixel values (rows, target_width)
+
+    Example:
+        >>> rows = np.zeros((3, 200), dtype=np.uint8)
+        >>> resize_image_batch(rows, 150).shape
+        (3, 150)
+    """
+    original_width = image_rows.shape[1]
+    if target_width == original_width:
+        return np.array(image_rows, dtype=np.uint8)
 
-    return resized_array
+    in_span: float | None = None
+    if reducing_gap is not None:
+        factor = int(original_width / target_width / reducing_gap)
+        if factor > 1:
+            image_rows = _box_reduce(image_rows, factor)
+            in_span = original_width / factor
+            original_width = image_rows.shape[1]
+
+    # Dot product per output pixel, rounded at half a unit; after clipping,
+    # the uint8 cast truncates, matching Pillow's shift by PRECISION_BITS
+    resized = image_rows @ _lanczos_matrix(original_width, target_width, in_span)
+    resized += 0.5
+    return np.clip(resized, 0, 255, out=resized).astype(np.uint8)
 
 
 def apply_colormap(
@@ -72,28 +258,97 @@ def apply_colormap(
         >>> rgb.shape
         (1, 3, 3)
     """
-    # Normalize to [0, 1] range
-    normalized = grayscale_array.astype(np.float32) / 255.0
+    # Treat the array as a single-row batch: (1, width) -> (1, width, 3)
+    return apply_colormap_batch(grayscale_array.reshape(1, -1), colormap_name)
+
+
+def apply_colormap_batch(
+    grayscale_rows: "NDArray[np.uint8]", colormap_name: ColormapName
+) -> "NDArray[np.uint8]":
+    """Apply colormap to a stack of grayscale rows in one call.
+
+    Args:
+        grayscale_rows: 2D array of grayscale pixel values (rows, width)
+        colormap_name: Name of colormap to apply
+
+    Returns:
+        NDArray[np.uint8]: 3D array of RGB values (rows, width, 3)
+
+    Example:
+        >>> rows = np.array([[0, 128, 255], [255, 128, 0]], dtype=np.uint8)
+        >>> apply_colormap_batch(rows, "viridis").shape
+        (2, 3, 3)
+    """
+    # Gather RGB triplets from the precomputed table: (rows, width, 3)
+    return _LUTS[colormap_name][grayscale_rows]
+
+
+def render_colormap_base64(
+    grayscale_rows: "NDArray[np.uint8]", colormap_name: ColormapName
+) -> list[str]:
+    """Colormap a stack of grayscale rows straight to base64 strings.
+
+    Equivalent to encode_rgb_rows_to_base64(apply_colormap_batch(...)), but
+    done as a single table gather with no intermediate RGB array.
+
+    Args:
+        grayscale_rows: 2D array of grayscale pixel values (rows, width)
+        colormap_name: Name of colormap to apply
+
+    Returns:
+        list[str]: Base64-encoded RGB string per row
+
+    Raises:
+        ValueError: If the batch is empty
+
+    Example:
+        >>> rows = np.array([[0, 128, 255]], dtype=np.uint8)
+        >>> render_colormap_base64(rows, "viridis") == encode_rgb_rows_to_base64(
+        ...     apply_colormap_batch(rows, "viridis")
+        ... )
+        True
+    """
+    if grayscale_rows.size == 0:
+        raise ValueError("Cannot encode empty array")
+
+    # (rows, width) packed ASCII groups, laid out exactly as the base64 text;
+    # decoded straight from the array buffer, without a bytes copy
+    encoded = str(np.take(_B64_LUTS[colormap_name], grayscale_rows).data, "ascii")
+
+    step = grayscale_rows.shape[1] * 4
+    return [encoded[start : start + step] for start in range(0, len(encoded), step)]
 
-    # Get colormap
-    colormap = cm.get_cmap(colormap_name)
 
-    # Apply colormap - colormap expects scalar or array, returns (N, 4) for array
-    rgba = colormap(normalized)
+def resize_colormap_b64(
+    image_array: "NDArray[np.uint8]", target_width: int, colormap_name: ColormapName
+) -> str:
+    """Resize a grayscale row, apply a colormap and base64-encode it in one pass.
+
+    Equivalent to encode_rgb_to_base64(apply_colormap(resize_image(...))),
+    but the colormap and encoding are a single table gather, so no RGB
+    array is materialized.
+
+    Args:
+        image_array: 1D array of pixel values (grayscale)
+        target_width: Target width for resized image
+        colormap_name: Name of colormap to apply
 
-    # Handle both scalar and array cases
-    if rgba.ndim == 1:
-        rgba = rgba.reshape(1, -1)
+    Returns:
+        str: Base64-encoded RGB string of the resized row
 
-    # Convert to uint8 and extract RGB (drop alpha)
-    rgb = (rgba[:, :3] * 255).astype(np.uint8)
+    Raises:
+        ValueError: If the image array is empty
 
-    # Reshape to (height, width, 3) for single row
-    height = 1
-    width = len(grayscale_array)
-    rgb_reshaped = rgb.reshape((height, width, 3))
+    Example:
+        >>> arr = np.array([1, 2, 3, 4] * 50, dtype=np.uint8)  # 200 pixels
+        >>> len(resize_colormap_b64(arr, 150, "viridis"))
+        600
+    """
+    if image_array.size == 0:
+        raise ValueError("Cannot encode empty array")
 
-    return rgb_reshaped
+    resized = resize_image(image_array, target_width)
+    return str(np.take(_B64_LUTS[colormap_name], resized).data, "ascii")
 
 
 def encode_rgb_to_base64(rgb_array: "NDArray[np.uint8]") -> str:
@@ -120,26 +375,63 @@ def encode_rgb_to_base64(rgb_array: "NDArray[np.uint8]") -> str:
     if rgb_array.dtype != np.uint8:
         raise ValueError(f"Expected uint8 array, got {rgb_array.dtype}")
 
-    # Flatten to 1D array
-    flattened = rgb_array.flatten()
-
-    # Encode to base64
-    encoded = base64.b64encode(flattened.tobytes()).decode("utf-8")
+    # Encode the contiguous buffer in place (no flattened copy, no tobytes())
+    # with pybase64's SIMD encoder, straight to str with no bytes decode
+    encoded = pybase64.b64encode_as_string(np.ascontiguousarray(rgb_array).data)
 
     return encoded
 
 
+def encode_rgb_rows_to_base64(rgb_rows: "NDArray[np.uint8]") -> list[str]:
+    """Encode each row of an RGB batch to its own base64 string.
+
+    Each row holds a multiple of 3 bytes, so its base64 form is unpadded and
+    the whole batch can be encoded at once and sliced at fixed offsets.
+
+    Args:
+        rgb_rows: 3D array of RGB values (rows, width, 3)
+
+    Returns:
+        list[str]: Base64-encoded string per row, identical to encoding
+            each row with encode_rgb_to_base64
+
+    Raises:
+        ValueError: If the batch is empty or not uint8
+
+    Example:
+        >>> rgb = np.zeros((2, 4, 3), dtype=np.uint8)
+        >>> len(encode_rgb_rows_to_base64(rgb))
+        2
+    """
+    if rgb_rows.size == 0:
+        raise ValueError("Cannot encode empty array")
+    if rgb_rows.dtype != np.uint8:
+        raise ValueError(f"Expected uint8 array, got {rgb_rows.dtype}")
+
+    encoded = pybase64.b64encode_as_string(np.ascontiguousarray(rgb_rows).data)
+
+    # 3 bytes per pixel -> 4 base64 characters per pixel
+    step = rgb_rows.shape[1] * 4
+    return [encoded[start : start + step] for start in range(0, len(encoded), step)]
+
+
 def calculate_image_statistics(
     image_array: "NDArray[np.uint8]",
 ) -> dict[str, float]:
     """Calculate image statistics (min, max, mean, std).
 
+    uint8 input is reduced to a 256-bin histogram in a single pass over the
+    pixels; all four statistics are then computed from the histogram.
+
     Args:
         image_array: Array of pixel values
 
     Returns:
         dict: Statistics with keys: min, max, mean, std
 
+    Raises:
+        ValueError: If the array is empty
+
     Example:
         >>> arr = np.array([0, 128, 255], dtype=np.uint8)
         >>> stats = calculate_image_statistics(arr)
@@ -148,10 +440,27 @@ def calculate_image_statistics(
         >>> stats["max"]
         255.0
     """
+    if image_array.size == 0:
+        raise ValueError("Cannot compute statistics of empty array")
+
+    if image_array.dtype != np.uint8:
+        return {
+            "min": float(np.min(image_array)),
+            "max": float(np.max(image_array)),
+            "mean": float(np.mean(image_array)),
+            "std": float(np.std(image_array)),
+        }
+
+    counts = np.bincount(image_array.ravel(), minlength=256)
+    present = np.flatnonzero(counts)
+    mean = float(counts @ _PIXEL_VALUES) / image_array.size
+    # Centered second moment, avoiding the cancellation of E[x^2] - E[x]^2
+    variance = float(counts @ np.square(_PIXEL_VALUES - mean)) / image_array.size
+
     return {
-        "min": float(np.min(image_array)),
-        "max": float(np.max(image_array)),
-        "mean": float(np.mean(image_array)),
-        "std": float(np.std(image_array)),
+        "min": float(present[0]),
+        "max": float(present[-1]),
+        "mean": mean,
+        "std": math.sqrt(variance),
     }
 
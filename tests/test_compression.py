@@ -1,12 +1,20 @@
 """Tests for compression utilities."""
 
+import gzip
+import io
+
 import numpy as np
 import pytest
 
+from image_api.config.settings import settings
 from image_api.utilities.compression import (
+    CODEC_BLOSC2,
+    CODEC_ZSTD,
     calculate_compression_ratio,
     compress_array,
+    compress_many,
     decompress_array,
+    pack_array,
 )
 
 
@@ -42,6 +50,120 @@ def test_compress_empty_array() -> None:
     assert np.array_equal(original, decompressed)
 
 
+def test_compress_many() -> None:
+    """Test batch compression round-trips through decompress_array."""
+    arrays = [
+        np.array([i % 256 for i in range(200)], dtype=np.uint8),
+        np.array([255, 0, 128], dtype=np.uint8),
+        np.array([i % 7 for i in range(200)], dtype=np.uint8),
+    ]
+
+    compressed = compress_many(arrays)
+
+    assert len(compressed) == len(arrays)
+    for original, data in zip(arrays, compressed, strict=True):
+        assert np.array_equal(original, decompress_array(data))
+
+
+def test_compress_uses_codec_tag() -> None:
+    """Test default codec output starts with the zstd tag."""
+    original = np.tile(np.arange(8, dtype=np.uint8), 25)
+
+    compressed = compress_array(original)
+
+    assert compressed[0] == CODEC_ZSTD
+
+
+def test_decompress_blosc2_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test Blosc2-tagged data round-trips."""
+    monkeypatch.setattr(settings, "compression_codec", "blosc2")
+    original = np.tile(np.arange(8, dtype=np.uint8), 25)
+
+    compressed = compress_array(original)
+
+    assert compressed[0] == CODEC_BLOSC2
+    assert np.array_equal(original, decompress_array(compressed))
+
+
+def test_compress_preserves_shape() -> None:
+    """Test multi-dimensional arrays keep their shape."""
+    original = np.arange(24, dtype=np.uint8).reshape(2, 3, 4)
+
+    decompressed = decompress_array(compress_array(original))
+
+    assert decompressed.shape == (2, 3, 4)
+    assert np.array_equal(original, decompressed)
+
+
+def test_pack_array_round_trip() -> None:
+    """Test uncompressed tagged data round-trips."""
+    original = np.array([i % 256 for i in range(150)], dtype=np.uint8)
+
+    packed = pack_array(original)
+    decompressed = decompress_array(packed)
+
+    assert packed[0] == 0x00
+    assert len(packed) == len(original) + 6  # tag, ndim, one uint32 dim
+    assert np.array_equal(original, decompressed)
+
+
+def test_decompress_gzip_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test gzip-tagged data round-trips."""
+    monkeypatch.setattr(settings, "compression_codec", "gzip")
+    original = np.tile(np.array([1, 2, 3, 4, 5, 255, 128, 0], dtype=np.uint8), 25)
+
+    compressed = compress_array(original)
+    batch = compress_many([original])
+
+    assert compressed[0] == 0x03
+    assert np.array_equal(original, decompress_array(compressed))
+    assert np.array_equal(original, decompress_array(batch[0]))
+
+
+def test_decompress_legacy_gzip_npy() -> None:
+    """Test untagged gzip/NPY data from older versions still decompresses."""
+    original = np.array([1, 2, 3, 4, 5, 255, 128, 0], dtype=np.uint8)
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as gz:
+        np.save(gz, original, allow_pickle=False)
+
+    assert np.array_equal(original, decompress_array(buffer.getvalue()))
+
+
+def test_decompress_zstd_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test zstd-tagged data round-trips."""
+    monkeypatch.setattr(settings, "compression_codec", "zstd")
+    original = np.tile(np.arange(20, dtype=np.uint8), (10, 1))
+
+    compressed = compress_array(original)
+    batch = compress_many([original, original])
+
+    assert compressed[0] == 0x02
+    assert np.array_equal(original, decompress_array(compressed))
+    assert all(np.array_equal(original, decompress_array(data)) for data in batch)
+
+
+@pytest.mark.parametrize("codec", ["blosc2", "zstd", "gzip"])
+def test_compress_falls_back_to_raw(codec: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test incompressible arrays are stored raw rather than growing."""
+    monkeypatch.setattr(settings, "compression_codec", codec)
+    original = np.random.default_rng(0).integers(0, 256, 200, dtype=np.uint8)
+
+    for compressed in (compress_array(original), *compress_many([original])):
+        assert compressed == pack_array(original)
+        assert np.array_equal(original, decompress_array(compressed))
+
+
+def test_decompress_returns_read_only_view() -> None:
+    """Test decompressed arrays are read-only views, not copies."""
+    original = np.arange(200, dtype=np.uint8)
+
+    for compressed in (compress_array(original), pack_array(original)):
+        decompressed = decompress_array(compressed)
+        assert np.array_equal(original, decompressed)
+        assert not decompressed.flags.writeable
+
+
 def test_decompress_invalid_data() -> None:
     """Test decompression with invalid data raises error."""
     invalid_data = b"not valid gzip data"
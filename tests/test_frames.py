@@ -0,0 +1,120 @@
+"""Tests for frame endpoints."""
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import orjson
+import pytest
+from cachetools import TTLCache
+from fastapi.testclient import TestClient
+
+from image_api.models.database import ImageFrame
+from image_api.routers import frames
+from image_api.service import app
+from image_api.utilities.compression import pack_array
+
+
+@pytest.fixture
+def frame_rows() -> list[ImageFrame]:
+    """Two in-memory frames returned by the fake cursor."""
+    return [
+        ImageFrame(
+            depth=Decimal("9000.10") + i,
+            resized_data=pack_array(np.arange(150, dtype=np.uint8)),
+            frame_metadata={"min": 0.0, "max": 149.0},
+        )
+        for i in range(2)
+    ]
+
+
+@pytest.fixture
+def frame_queries(
+    monkeypatch: pytest.MonkeyPatch, frame_rows: list[ImageFrame]
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Serve the in-memory frames instead of querying the database."""
+    queries: list[tuple[Any, ...]] = []
+
+    async def fake_batches(*args: Any) -> AsyncIterator[list[ImageFrame]]:
+        queries.append(args[1:])
+        yield frame_rows
+
+    async def fake_session() -> AsyncIterator[None]:
+        yield None
+
+    monkeypatch.setattr(frames, "get_frame_batches", fake_batches)
+    # /frames takes its session from the dependency; /frames/stream opens its own
+    app.dependency_overrides[frames.get_session] = fake_session
+    monkeypatch.setattr(frames.db_client, "session", asynccontextmanager(fake_session))
+    frames._frames_cache.clear()
+    yield queries
+    app.dependency_overrides.clear()
+    frames._frames_cache.clear()
+
+
+def test_get_frames_repeat_query_hits_cache(
+    client: TestClient, frame_queries: list[tuple[Any, ...]]
+) -> None:
+    """Test a repeated query is served from the response cache."""
+    url = "/frames?depth_min=9000&depth_max=9100&colormap=hot"
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    assert second.content == first.content
+    assert len(frame_queries) == 1
+
+
+def test_get_frames_oversized_body_not_cached(
+    client: TestClient, frame_queries: list[tuple[Any, ...]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a body larger than the cache budget is served but not stored."""
+    monkeypatch.setattr(frames, "_frames_cache", TTLCache(maxsize=100, ttl=60, getsizeof=len))
+    url = "/frames?depth_min=9000&depth_max=9100&colormap=hot"
+
+    response = client.get(url)
+    client.get(url)
+
+    assert response.status_code == 200
+    assert len(frames._frames_cache) == 0
+    assert len(frame_queries) == 2
+
+
+def test_stream_frames_matches_get_frames(
+    client: TestClient, frame_queries: list[tuple[Any, ...]]
+) -> None:
+    """Test the NDJSON stream carries the same frames as GET /frames."""
+    params = "depth_min=9000&depth_max=9100&colormap=hot"
+
+    streamed = client.get(f"/frames/stream?{params}")
+    buffered = client.get(f"/frames?{params}")
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    lines = streamed.content.splitlines()
+    assert len(lines) == 2
+    assert [orjson.loads(line) for line in lines] == buffered.json()
+
+
+def test_stream_frames_skips_undecodable_frame(
+    client: TestClient, frame_queries: list[tuple[Any, ...]], frame_rows: list[ImageFrame]
+) -> None:
+    """Test a frame whose data cannot be decoded is skipped, not fatal."""
+    frame_rows.insert(
+        1,
+        ImageFrame(
+            depth=Decimal("9000.50"),
+            resized_data=b"not a frame",
+            frame_metadata={},
+        ),
+    )
+
+    response = client.get("/frames/stream?depth_min=9000&depth_max=9100")
+
+    assert response.status_code == 200
+    depths = [orjson.loads(line)["depth"] for line in response.content.splitlines()]
+    assert depths == [9000.1, 9001.1]
@@ -2,14 +2,21 @@
 
 import base64
 
+import matplotlib
 import numpy as np
 import pytest
+from PIL import Image
 
 from image_api.utilities.image_processing import (
     apply_colormap,
+    apply_colormap_batch,
     calculate_image_statistics,
+    encode_rgb_rows_to_base64,
     encode_rgb_to_base64,
+    render_colormap_base64,
+    resize_colormap_b64,
     resize_image,
+    resize_image_batch,
 )
 
 
@@ -26,6 +33,47 @@ def test_resize_image() -> None:
     assert isinstance(resized, np.ndarray)
 
 
+@pytest.mark.parametrize(
+    ("width", "target_width"), [(200, 150), (200, 77), (50, 120), (1, 5), (7, 3)]
+)
+def test_resize_image_matches_pillow(width: int, target_width: int) -> None:
+    """Test the NumPy resampler is bit-identical to Pillow's LANCZOS."""
+    rng = np.random.default_rng(width * target_width)
+    original_array = rng.integers(0, 256, width, dtype=np.uint8)
+
+    expected = Image.fromarray(original_array.reshape(1, -1)).resize(
+        (target_width, 1), resample=Image.Resampling.LANCZOS
+    )
+
+    assert np.array_equal(resize_image(original_array, target_width), np.asarray(expected)[0])
+
+
+@pytest.mark.parametrize("reducing_gap", [1.5, 2.0, 3.0])
+def test_resize_image_reducing_gap_matches_pillow(reducing_gap: float) -> None:
+    """Test box pre-reduction for large downscales matches Pillow."""
+    original_array = np.random.default_rng(7).integers(0, 256, 1001, dtype=np.uint8)
+
+    expected = Image.fromarray(original_array.reshape(1, -1)).resize(
+        (40, 1), resample=Image.Resampling.LANCZOS, reducing_gap=reducing_gap
+    )
+
+    resized = resize_image(original_array, 40, reducing_gap=reducing_gap)
+
+    assert np.array_equal(resized, np.asarray(expected)[0])
+
+
+@pytest.mark.parametrize("reducing_gap", [None, 2.0])
+def test_resize_image_batch_matches_single_rows(reducing_gap: float | None) -> None:
+    """Test batch resizing matches resizing each row on its own."""
+    rows = np.random.default_rng(3).integers(0, 256, (5, 203), dtype=np.uint8)
+
+    resized = resize_image_batch(rows, 40, reducing_gap=reducing_gap)
+
+    assert resized.shape == (5, 40)
+    for i, row in enumerate(rows):
+        assert np.array_equal(resized[i], resize_image(row, 40, reducing_gap=reducing_gap))
+
+
 def test_apply_colormap() -> None:
     """Test colormap application."""
     # Create a simple grayscale array
@@ -50,6 +98,30 @@ def test_apply_colormap_different_colormaps() -> None:
         assert rgb.dtype == np.uint8
 
 
+def test_apply_colormap_matches_matplotlib() -> None:
+    """Test the lookup table matches evaluating the colormap per pixel."""
+    grayscale = np.random.default_rng(0).integers(0, 256, 500, dtype=np.uint8)
+
+    for colormap_name in ["viridis", "plasma", "hot", "cool", "gray"]:
+        rgba = matplotlib.colormaps[colormap_name](grayscale.astype(np.float32) / 255.0)
+        expected = (rgba[:, :3] * 255).astype(np.uint8)
+
+        rgb = apply_colormap(grayscale, colormap_name)  # type: ignore[arg-type]
+
+        assert np.array_equal(rgb[0], expected)
+
+
+def test_apply_colormap_batch_matches_single_rows() -> None:
+    """Test batch colormap matches applying the colormap row by row."""
+    rows = np.array([[0, 64, 128, 255], [255, 10, 20, 30]], dtype=np.uint8)
+
+    rgb = apply_colormap_batch(rows, "plasma")
+
+    assert rgb.shape == (2, 4, 3)
+    for i, row in enumerate(rows):
+        assert np.array_equal(rgb[i], apply_colormap(row, "plasma")[0])
+
+
 def test_encode_rgb_to_base64() -> None:
     """Test RGB to base64 encoding."""
     # Create a simple RGB array
@@ -71,6 +143,33 @@ def test_encode_rgb_to_base64_empty_array() -> None:
         encode_rgb_to_base64(rgb)
 
 
+def test_encode_rgb_rows_to_base64_matches_single_rows() -> None:
+    """Test batch encoding matches encoding each row separately."""
+    rgb = np.arange(2 * 5 * 3, dtype=np.uint8).reshape(2, 5, 3)
+
+    encoded = encode_rgb_rows_to_base64(rgb)
+
+    assert encoded == [encode_rgb_to_base64(rgb[i : i + 1]) for i in range(2)]
+
+
+def test_render_colormap_base64_matches_two_step() -> None:
+    """Test fused colormap + base64 matches the separate steps."""
+    rows = np.array([[i % 256 for i in range(150)], [255 - i for i in range(150)]], dtype=np.uint8)
+
+    for colormap_name in ["viridis", "hot", "turbo"]:
+        expected = encode_rgb_rows_to_base64(apply_colormap_batch(rows, colormap_name))  # type: ignore[arg-type]
+        assert render_colormap_base64(rows, colormap_name) == expected  # type: ignore[arg-type]
+
+
+def test_resize_colormap_b64_matches_pipeline() -> None:
+    """Test the fused pipeline matches resize, colormap and encode in turn."""
+    original = np.array([i % 256 for i in range(200)], dtype=np.uint8)
+
+    expected = encode_rgb_to_base64(apply_colormap(resize_image(original, 150), "hot"))
+
+    assert resize_colormap_b64(original, 150, "hot") == expected
+
+
 def test_calculate_image_statistics() -> None:
     """Test image statistics calculation."""
     image_array = np.array([0, 128, 255], dtype=np.uint8)
@@ -96,3 +195,19 @@ def test_calculate_image_statistics_single_value() -> None:
     assert stats["std"] == 0.0
 
 
+def test_calculate_image_statistics_matches_numpy() -> None:
+    """Test histogram statistics agree with direct NumPy reductions."""
+    image_array = np.random.default_rng(0).integers(0, 256, 200, dtype=np.uint8)
+
+    stats = calculate_image_statistics(image_array)
+
+    assert stats["min"] == float(np.min(image_array))
+    assert stats["max"] == float(np.max(image_array))
+    assert stats["mean"] == pytest.approx(float(np.mean(image_array)))
+    assert stats["std"] == pytest.approx(float(np.std(image_array)))
+
+
+def test_calculate_image_statistics_empty_array() -> None:
+    """Test statistics of an empty array raise an error."""
+    with pytest.raises(ValueError, match="empty"):
+        calculate_image_statistics(np.array([], dtype=np.uint8))
@@ -0,0 +1,103 @@
+"""Tests for the CSV ingestion script."""
+
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from image_api.config.settings import settings
+from image_api.utilities.compression import CODEC_RAW, decompress_array
+from image_api.utilities.image_processing import resize_image
+from scripts.ingest_csv import (
+    COLS,
+    _csv_usecols,
+    _parse_csv_lines,
+    _parse_line,
+    _parse_rows,
+    _process_rows,
+)
+
+WIDTH = settings.image_original_width
+USECOLS = _csv_usecols(",".join(["depth", *COLS]))
+
+
+def _line(depth: str, pixels: list[str]) -> str:
+    """Build a CSV data line from a depth and pixel cells."""
+    return ",".join([depth, *pixels])
+
+
+VALID_LINES = [
+    _line("9000.1", [str(i % 256) for i in range(WIDTH)]),
+    _line("9000.2", ["255"] * WIDTH),
+]
+
+BAD_LINES = {
+    "nan": _line("9000.3", ["nan"] + ["1"] * (WIDTH - 1)),
+    "fractional": _line("9000.4", ["1.5"] + ["1"] * (WIDTH - 1)),
+    "too large": _line("9000.5", ["256"] + ["1"] * (WIDTH - 1)),
+    "negative": _line("9000.6", ["-1"] + ["1"] * (WIDTH - 1)),
+    "missing column": _line("9000.7", ["1"] * (WIDTH - 1)),
+}
+
+
+def test_parse_csv_lines_skips_malformed_rows(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test only valid rows survive a block with blank and malformed lines."""
+    lines = [VALID_LINES[0], "", *BAD_LINES.values(), VALID_LINES[1]]
+
+    depths, pixels = _parse_csv_lines(lines, USECOLS)
+
+    assert depths.tolist() == [9000.1, 9000.2]
+    assert pixels.dtype == np.uint8
+    assert pixels.shape == (2, WIDTH)
+    assert pixels[0].tolist() == [i % 256 for i in range(WIDTH)]
+    assert pixels[1].tolist() == [255] * WIDTH
+    assert capsys.readouterr().err.count("Error processing row") == len(BAD_LINES)
+
+
+def test_parse_paths_agree_on_valid_rows() -> None:
+    """Test the vectorized and per-line parsers return the same rows."""
+    depths, pixels = _parse_rows(VALID_LINES, USECOLS)
+    per_line = [_parse_line(line, USECOLS) for line in VALID_LINES]
+
+    assert depths.tolist() == [depth for depth, _ in per_line]
+    assert np.array_equal(pixels, np.stack([row for _, row in per_line]))
+
+
+@pytest.mark.parametrize("line", BAD_LINES.values(), ids=BAD_LINES.keys())
+def test_parse_paths_reject_malformed_row(line: str) -> None:
+    """Test both parsers raise ValueError on a malformed row."""
+    with pytest.raises(ValueError):
+        _parse_rows([line], USECOLS)
+    with pytest.raises(ValueError):
+        _parse_line(line, USECOLS)
+
+
+def test_process_rows_builds_copy_record() -> None:
+    """Test a processed row keeps its exact depth, metadata and raw resized blob."""
+    pixels = np.tile(np.arange(8, dtype=np.uint8), (1, WIDTH // 8))
+
+    records = _process_rows(np.array([1.005]), pixels, first_row=1)
+
+    assert len(records) == 1
+    depth, original_data, resized_data, metadata_json = records[0]
+    # The exact CSV decimal, so PostgreSQL rounds it half-up to 1.01
+    assert depth == Decimal("1.005")
+    assert str(depth) == "1.005"
+
+    assert np.array_equal(decompress_array(original_data), pixels[0])
+
+    assert resized_data[0] == CODEC_RAW
+    assert np.array_equal(
+        decompress_array(resized_data),
+        resize_image(pixels[0], settings.image_resized_width),
+    )
+
+    metadata = json.loads(metadata_json)
+    assert metadata["min"] == 0.0
+    assert metadata["max"] == 7.0
+    assert metadata["mean"] == pytest.approx(3.5)
+    assert metadata["compression_ratio_original"] == pytest.approx(
+        WIDTH / len(original_data)
+    )
+    assert metadata["compression_ratio_resized"] == 1.0
@@ -33,6 +33,48 @@ def test_json_formatter() -> None:
     assert "line" in data
 
 
+def test_json_formatter_timestamp_matches_default() -> None:
+    """Test cached timestamps match the standard formatter output."""
+    formatter = JSONFormatter()
+    reference = logging.Formatter()
+
+    for created in (1700000000.125, 1700000000.987, 1700000001.5):
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=1,
+            msg="Test message",
+            args=(),
+            exc_info=None,
+        )
+        record.created = created
+        record.msecs = int((created - int(created)) * 1000)
+
+        data = json.loads(formatter.format(record))
+        assert data["timestamp"] == reference.formatTime(record)
+
+
+def test_json_formatter_serializes_unusual_extra_fields() -> None:
+    """Test extra fields orjson rejects by default are still logged."""
+    formatter = JSONFormatter()
+    record = logging.LogRecord(
+        name="test",
+        level=logging.INFO,
+        pathname="test.py",
+        lineno=1,
+        msg="Test message",
+        args=(),
+        exc_info=None,
+    )
+    record.extra_fields = {"counts": {1: "one"}, "big": 2**70}
+
+    data = json.loads(formatter.format(record))
+
+    assert data["counts"] == {"1": "one"}
+    assert data["big"] == 2**70
+
+
 def test_json_formatter_with_exception() -> None:
     """Test JSON formatter with exception info."""
     formatter = JSONFormatter()